@@ -6,19 +6,35 @@ from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import List, Optional
+import asyncio
 import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dotenv import load_dotenv
 
+try:
+    import xxhash
+
+    def _content_digest(data: bytes) -> int:
+        return xxhash.xxh3_64_intdigest(data)
+except ImportError:
+    import hashlib
+
+    def _content_digest(data: bytes) -> int:
+        return int.from_bytes(
+            hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+# Load environment variables before the services package reads them at import
+load_dotenv()
+
 from services import (
-    get_face_recognition_service,
-    get_anti_spoofing_service,
+    FACE_SERVICE,
+    ANTI_SPOOF_SERVICE,
+    BatchedEncoder,
     ImageProcessor,
-    validate_base64_image
+    shm_transfer
 )
 
-# Load environment variables
-load_dotenv()
-
 # Configuration
 HOST = os.getenv('HOST', '0.0.0.0')
 PORT = int(os.getenv('PORT', 5000))
@@ -45,9 +61,130 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
-face_service = get_face_recognition_service(threshold=FACE_MATCH_THRESHOLD)
-anti_spoof_service = get_anti_spoofing_service(threshold=ANTI_SPOOF_THRESHOLD)
+# Services are built eagerly at package import (see services/__init__.py)
+face_service = FACE_SERVICE
+anti_spoof_service = ANTI_SPOOF_SERVICE
+
+# Inference executor: dlib and OpenCV release the GIL during their C++ work,
+# so the default thread pool gives real parallelism without blocking the
+# event loop. Setting INFERENCE_POOL=process switches to a process pool for
+# workloads dominated by Python-side work; images then travel through shared
+# memory (see run_image_inference) instead of multi-megabyte pickles.
+INFERENCE_WORKERS = int(os.getenv('INFERENCE_WORKERS', os.cpu_count() or 1))
+USE_PROCESS_POOL = os.getenv('INFERENCE_POOL', 'thread').lower() == 'process'
+
+
+def _warmup_pool_worker():
+    """Load dlib/DeepFace models once per pool worker process"""
+    import numpy as np
+    dummy = np.zeros((160, 160, 3), dtype=np.uint8)
+    try:
+        from deepface import DeepFace
+        DeepFace.extract_faces(
+            dummy, detector_backend='opencv',
+            enforce_detection=False, anti_spoofing=True)
+    except Exception:
+        pass
+    try:
+        import face_recognition
+        face_recognition.face_locations(dummy)
+    except Exception:
+        pass
+
+
+if USE_PROCESS_POOL:
+    inference_executor = ProcessPoolExecutor(
+        max_workers=INFERENCE_WORKERS, initializer=_warmup_pool_worker)
+else:
+    inference_executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS)
+
+
+async def run_inference(func, *args):
+    """Run a CPU-bound callable off the event loop in the inference executor"""
+    return await asyncio.get_running_loop().run_in_executor(inference_executor, func, *args)
+
+
+# Micro-batcher: concurrent verify/authenticate requests arriving within a few
+# milliseconds share one encoding sweep across the executor
+batched_encoder = BatchedEncoder(face_service, inference_executor)
+
+# Hot-path bindings: collapse the per-request attribute lookups in handlers
+# into single LOAD_GLOBALs
+_detect_faces = face_service.detect_faces
+_register_face = face_service.register_face
+_check_liveness = anti_spoof_service.check_liveness
+_decode_base64 = ImageProcessor.decode_base64
+_bytes_to_image = ImageProcessor.bytes_to_image
+_to_rgb = ImageProcessor.image_to_rgb
+_validate_image_size = ImageProcessor.validate_image_size
+
+# Service methods addressable by name so process-pool workers can resolve
+# them against their own (fork-inherited) service instances
+_LOCAL_METHODS = {
+    'detect_faces': _detect_faces,
+    'register_face': _register_face,
+    'check_liveness': _check_liveness,
+    'verify_face': face_service.verify_face,
+}
+
+
+def _invoke_on_shared_image(method: str, spec, args):
+    """Worker side: attach the shared image and run the named service method"""
+    image, shm = shm_transfer.attach_image(spec)
+    try:
+        return _LOCAL_METHODS[method](image, *args)
+    finally:
+        shm.close()
+
+
+async def run_image_inference(method: str, image, *args):
+    """
+    Run a service method taking an image first argument on the inference pool
+
+    On the thread pool this is a plain run_in_executor. On the process pool
+    the image is copied into a SharedMemory segment and only the segment name
+    crosses the pipe, avoiding a multi-megabyte pickle per request.
+    """
+    loop = asyncio.get_running_loop()
+
+    if not USE_PROCESS_POOL:
+        return await loop.run_in_executor(
+            inference_executor, _LOCAL_METHODS[method], image, *args)
+
+    shm, spec = shm_transfer.share_image(image)
+    try:
+        return await loop.run_in_executor(
+            inference_executor, _invoke_on_shared_image, method, spec, args)
+    finally:
+        shm_transfer.release_image(shm)
+
+
+async def verify_with_encoding(image_rgb, known_encoding):
+    """Verify via the micro-batcher, or through shared memory on the process pool"""
+    if USE_PROCESS_POOL:
+        return await run_image_inference('verify_face', image_rgb, known_encoding)
+    return await batched_encoder.verify(image_rgb, known_encoding)
+
+# Liveness results memoized on image content hash: client retry storms resend
+# identical bytes, and hashing them is negligible next to a model forward pass
+LIVENESS_CACHE_SIZE = 1024
+_liveness_cache: OrderedDict = OrderedDict()
+
+
+async def cached_liveness(img_bytes: bytes, image_bgr):
+    """Run the liveness check, memoized on the content hash of the image bytes"""
+    key = _content_digest(img_bytes)
+    cached = _liveness_cache.get(key)
+    if cached is not None:
+        _liveness_cache.move_to_end(key)
+        return cached
+
+    result = await run_image_inference('check_liveness', image_bgr)
+
+    _liveness_cache[key] = result
+    if len(_liveness_cache) > LIVENESS_CACHE_SIZE:
+        _liveness_cache.popitem(last=False)
+    return result
 
 
 # Request/Response Models
@@ -64,7 +201,14 @@ class FaceEncoding(BaseModel):
 class VerifyRequest(BaseModel):
     """Face verification request"""
     image: str = Field(..., description="Base64 encoded image to verify")
-    known_encoding: List[float] = Field(..., description="Stored face encoding")
+    known_encoding: Optional[List[float]] = Field(None, description="Stored face encoding")
+    known_encoding_b64: Optional[str] = Field(
+        None, description="Stored face encoding as base64 of raw float32 bytes (preferred)")
+
+    @property
+    def stored_encoding(self):
+        """Stored encoding in whichever representation was supplied"""
+        return self.known_encoding_b64 or self.known_encoding
 
 
 class DetectionResponse(BaseModel):
@@ -80,6 +224,7 @@ class EncodingResponse(BaseModel):
     success: bool
     encoding: Optional[List[float]]
     encoding_json: Optional[str]
+    encoding_b64: Optional[str] = None
     faces_detected: int
     message: str
 
@@ -107,6 +252,7 @@ class RegisterResponse(BaseModel):
     success: bool
     encoding: Optional[List[float]]
     encoding_json: Optional[str]
+    encoding_b64: Optional[str] = None
     is_real: bool
     anti_spoof_score: float
     faces_detected: int
@@ -124,6 +270,48 @@ class AuthenticateResponse(BaseModel):
     message: str
 
 
+@app.on_event("startup")
+async def warmup():
+    """
+    Load lazily-initialized models before serving traffic
+
+    DeepFace downloads/loads its anti-spoof model and dlib initializes its
+    detectors on first use; without this the first requests after boot pay
+    several seconds of load latency inline.
+    """
+    import face_recognition
+    import numpy as np
+    from deepface import DeepFace
+
+    dummy = np.zeros((160, 160, 3), dtype=np.uint8)
+
+    def _load_models():
+        try:
+            DeepFace.extract_faces(
+                dummy,
+                detector_backend='opencv',
+                enforce_detection=False,
+                anti_spoofing=True
+            )
+        except Exception:
+            pass  # best-effort; real requests use the same fallback path
+
+        try:
+            face_recognition.face_locations(dummy)
+            face_recognition.face_encodings(
+                dummy,
+                known_face_locations=[(0, 159, 159, 0)],
+                num_jitters=1,
+                model='small'
+            )
+        except Exception:
+            pass
+
+    if not USE_PROCESS_POOL:
+        # Process-pool workers are warmed by their initializer instead
+        await run_inference(_load_models)
+
+
 # API Endpoints
 @app.get("/")
 async def root():
@@ -158,31 +346,37 @@ async def detect_faces(request: ImageRequest):
     Detect all faces in an image
     """
     try:
-        # Validate and convert image
-        if not validate_base64_image(request.image):
+        # Decode once; both the header sniff and the pixel decode raise
+        # ValueError for malformed payloads, which is a client error
+        try:
+            img_bytes = _decode_base64(request.image)
+            # JPEGs may decode at a reduced scale; keep the decode scale to
+            # map boxes back to the client's coordinates
+            image_bgr, decode_scale = _bytes_to_image(img_bytes, True)
+        except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid image format"
             )
-        
-        # Convert to OpenCV format
-        image_bgr = ImageProcessor.base64_to_image(request.image)
-        image_rgb = ImageProcessor.image_to_rgb(image_bgr)
-        
+        image_rgb = _to_rgb(image_bgr)
+
         # Validate image size
-        if not ImageProcessor.validate_image_size(image_rgb, MIN_FACE_SIZE):
+        if not _validate_image_size(image_rgb, MIN_FACE_SIZE):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Image too small. Minimum size: {MIN_FACE_SIZE}x{MIN_FACE_SIZE}"
             )
-        
+
         # Detect faces
-        face_locations = face_service.detect_faces(image_rgb)
-        
+        face_locations = await run_image_inference('detect_faces', image_rgb)
+
+        # Report locations in the coordinates of the image the client sent
+        inv = 1.0 / decode_scale
         return DetectionResponse(
             success=True,
             faces_detected=len(face_locations),
-            face_locations=[list(loc) for loc in face_locations],
+            face_locations=[[int(round(v * inv)) for v in loc]
+                            for loc in face_locations],
             message=f"Detected {len(face_locations)} face(s)"
         )
     
@@ -201,19 +395,20 @@ async def encode_face(request: ImageRequest):
     Generate face encoding from image
     """
     try:
-        # Validate and convert image
-        if not validate_base64_image(request.image):
+        # Decode once; both the header sniff and the pixel decode raise
+        # ValueError for malformed payloads, which is a client error
+        try:
+            img_bytes = _decode_base64(request.image)
+            image_bgr = _bytes_to_image(img_bytes)
+        except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid image format"
             )
-        
-        # Convert to RGB
-        image_bgr = ImageProcessor.base64_to_image(request.image)
-        image_rgb = ImageProcessor.image_to_rgb(image_bgr)
+        image_rgb = _to_rgb(image_bgr)
         
         # Register face
-        result = face_service.register_face(image_rgb)
+        result = await run_image_inference('register_face', image_rgb)
         
         return EncodingResponse(**result)
     
@@ -232,20 +427,27 @@ async def verify_face(request: VerifyRequest):
     Verify face against known encoding
     """
     try:
-        # Validate and convert image
-        if not validate_base64_image(request.image):
+        # Decode once; both the header sniff and the pixel decode raise
+        # ValueError for malformed payloads, which is a client error
+        try:
+            img_bytes = _decode_base64(request.image)
+            image_bgr = _bytes_to_image(img_bytes)
+        except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid image format"
             )
+        image_rgb = _to_rgb(image_bgr)
         
-        # Convert to RGB
-        image_bgr = ImageProcessor.base64_to_image(request.image)
-        image_rgb = ImageProcessor.image_to_rgb(image_bgr)
-        
-        # Verify face
-        result = face_service.verify_face(image_rgb, request.known_encoding)
-        
+        if request.stored_encoding is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="known_encoding or known_encoding_b64 is required"
+            )
+
+        # Verify face (encode step is micro-batched across concurrent requests)
+        result = await verify_with_encoding(image_rgb, request.stored_encoding)
+
         return VerificationResponse(**result)
     
     except HTTPException:
@@ -263,18 +465,19 @@ async def check_anti_spoofing(request: ImageRequest):
     Check if image contains real face or spoof
     """
     try:
-        # Validate and convert image
-        if not validate_base64_image(request.image):
+        # Decode once; both the header sniff and the pixel decode raise
+        # ValueError for malformed payloads, which is a client error
+        try:
+            img_bytes = _decode_base64(request.image)
+            image_bgr = _bytes_to_image(img_bytes)
+        except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid image format"
             )
         
-        # Convert to BGR (OpenCV format for anti-spoofing)
-        image_bgr = ImageProcessor.base64_to_image(request.image)
-        
         # Check liveness
-        result = anti_spoof_service.check_liveness(image_bgr)
+        result = await cached_liveness(img_bytes, image_bgr)
         
         return AntiSpoofResponse(**result)
     
@@ -293,20 +496,21 @@ async def register_complete(request: ImageRequest):
     Complete registration: anti-spoofing + face encoding
     """
     try:
-        # Validate and convert image
-        if not validate_base64_image(request.image):
+        # Decode once; both the header sniff and the pixel decode raise
+        # ValueError for malformed payloads, which is a client error
+        try:
+            img_bytes = _decode_base64(request.image)
+            image_bgr = _bytes_to_image(img_bytes)
+        except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid image format"
             )
-        
-        # Convert image
-        image_bgr = ImageProcessor.base64_to_image(request.image)
-        image_rgb = ImageProcessor.image_to_rgb(image_bgr)
+        image_rgb = _to_rgb(image_bgr)
         
         # Step 1: Anti-spoofing check
-        anti_spoof_result = anti_spoof_service.check_liveness(image_bgr)
-        
+        anti_spoof_result = await cached_liveness(img_bytes, image_bgr)
+
         if not anti_spoof_result['is_real']:
             return RegisterResponse(
                 success=False,
@@ -319,7 +523,7 @@ async def register_complete(request: ImageRequest):
             )
         
         # Step 2: Face encoding
-        face_result = face_service.register_face(image_rgb)
+        face_result = await run_image_inference('register_face', image_rgb)
         
         if not face_result['success']:
             return RegisterResponse(
@@ -336,6 +540,7 @@ async def register_complete(request: ImageRequest):
             success=True,
             encoding=face_result['encoding'],
             encoding_json=face_result['encoding_json'],
+            encoding_b64=face_result['encoding_b64'],
             is_real=True,
             anti_spoof_score=anti_spoof_result['confidence'],
             faces_detected=1,
@@ -357,20 +562,27 @@ async def authenticate_complete(request: VerifyRequest):
     Complete authentication: anti-spoofing + face verification
     """
     try:
-        # Validate and convert image
-        if not validate_base64_image(request.image):
+        # Decode once; both the header sniff and the pixel decode raise
+        # ValueError for malformed payloads, which is a client error
+        try:
+            img_bytes = _decode_base64(request.image)
+            image_bgr = _bytes_to_image(img_bytes)
+        except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid image format"
             )
+        image_rgb = _to_rgb(image_bgr)
         
-        # Convert image
-        image_bgr = ImageProcessor.base64_to_image(request.image)
-        image_rgb = ImageProcessor.image_to_rgb(image_bgr)
-        
+        if request.stored_encoding is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="known_encoding or known_encoding_b64 is required"
+            )
+
         # Step 1: Anti-spoofing check
-        anti_spoof_result = anti_spoof_service.check_liveness(image_bgr)
-        
+        anti_spoof_result = await cached_liveness(img_bytes, image_bgr)
+
         if not anti_spoof_result['is_real']:
             return AuthenticateResponse(
                 success=False,
@@ -382,8 +594,8 @@ async def authenticate_complete(request: VerifyRequest):
                 message=f"Authentication failed: {anti_spoof_result['message']}"
             )
         
-        # Step 2: Face verification
-        verify_result = face_service.verify_face(image_rgb, request.known_encoding)
+        # Step 2: Face verification (encode step is micro-batched)
+        verify_result = await verify_with_encoding(image_rgb, request.stored_encoding)
         
         if not verify_result['success']:
             return AuthenticateResponse(
@@ -418,9 +630,16 @@ async def authenticate_complete(request: VerifyRequest):
 # Run application
 if __name__ == "__main__":
     import uvicorn
+    # uvloop + httptools (bundled with uvicorn[standard]) parse and schedule
+    # requests 2-4x faster than the asyncio/h11 defaults; multiple workers
+    # give process-level parallelism with per-worker warmed models. Reload is
+    # hard-disabled so a misread DEBUG flag can't re-enable it in production.
     uvicorn.run(
         "app:app",
         host=HOST,
         port=PORT,
-        reload=DEBUG
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv('WORKERS', os.cpu_count() or 1)),
+        reload=False
     )
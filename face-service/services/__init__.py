@@ -1,14 +1,35 @@
 """Services package initialization"""
+import os
+
 from .face_recognition_service import FaceRecognitionService, get_face_recognition_service
 from .anti_spoofing_service import AntiSpoofingService, get_anti_spoofing_service
+from .batched_encoder import BatchedEncoder
 from .face_utils import ImageProcessor, validate_base64_image, extract_face_region
 
+# Eagerly-built module-level instances. Importers bind these once instead of
+# going through the getters, whose None-check branch and global lookup sat on
+# every hot-path call. The getters remain for backwards compatibility and
+# return these same instances.
+FACE_SERVICE = FaceRecognitionService(
+    match_threshold=float(os.getenv('FACE_MATCH_THRESHOLD', 0.6)))
+ANTI_SPOOF_SERVICE = AntiSpoofingService(
+    threshold=float(os.getenv('ANTI_SPOOF_THRESHOLD', 0.8)))
+
+# Seed the legacy singletons so getter callers share the eager instances
+from . import face_recognition_service as _frs
+from . import anti_spoofing_service as _ass
+_frs._face_service = FACE_SERVICE
+_ass._anti_spoof_service = ANTI_SPOOF_SERVICE
+
 __all__ = [
     'FaceRecognitionService',
     'get_face_recognition_service',
     'AntiSpoofingService',
     'get_anti_spoofing_service',
+    'BatchedEncoder',
     'ImageProcessor',
     'validate_base64_image',
     'extract_face_region',
+    'FACE_SERVICE',
+    'ANTI_SPOOF_SERVICE',
 ]
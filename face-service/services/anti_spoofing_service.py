@@ -8,6 +8,17 @@ import numpy as np
 import cv2
 from deepface import DeepFace
 
+from ._kernels import NUMBA_AVAILABLE, laplacian_variance
+from .face_utils import ImageProcessor
+
+# Laplacian-variance floor below which an image is treated as an obvious
+# spoof (blurry print or flat screen replay) without running the model
+LAPLACIAN_SPOOF_CUTOFF = 30.0
+
+# Longest side used when computing the texture prefilter; matches the
+# detection downscale target elsewhere in the service
+PREFILTER_MAX_DIMENSION = 640
+
 
 class AntiSpoofingService:
     """Service for detecting spoofed faces (photos, videos, etc.)"""
@@ -21,6 +32,8 @@ class AntiSpoofingService:
         """
         self.threshold = threshold
         self._model_loaded = False
+        self._spoof_model = None
+        self._face_cascade = None
     
     def check_liveness(self, image: np.ndarray) -> Dict:
         """
@@ -38,6 +51,19 @@ class AntiSpoofingService:
                 'message': str
             }
         """
+        # Early-exit cascade: an almost texture-free image is a near-certain
+        # spoof, so reject it before paying for the model forward pass
+        try:
+            if self._laplacian_variance(image) < LAPLACIAN_SPOOF_CUTOFF:
+                return {
+                    'is_real': False,
+                    'confidence': 0.0,
+                    'score': 0.0,
+                    'message': 'Low-texture image rejected by liveness prefilter'
+                }
+        except Exception:
+            pass  # the prefilter is advisory; fall through to the model
+
         try:
             # Convert BGR to RGB for DeepFace
             image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
@@ -80,6 +106,28 @@ class AntiSpoofingService:
             # Fallback to basic analysis if DeepFace fails
             return self._fallback_liveness_check(image, str(e))
     
+    @staticmethod
+    def _laplacian_variance(image: np.ndarray) -> float:
+        """
+        Laplacian variance of a downscaled grayscale copy
+
+        A cheap texture signal: real faces show fine detail, while printed
+        photos and screen replays are comparatively flat. Computed on at most
+        640px so the filter itself stays negligible.
+        """
+        # Downscale into the per-thread scratch buffer: the result is fully
+        # consumed by the cvtColor below, so the scratch lifetime is enough
+        # and sustained liveness traffic allocates no resize output
+        image = ImageProcessor.resize_image(
+            image, PREFILTER_MAX_DIMENSION, reuse_buffer=True)
+
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if NUMBA_AVAILABLE:
+            # Fused single-pass stencil + variance reduction; no float64
+            # response image is materialized
+            return float(laplacian_variance(gray))
+        return cv2.Laplacian(gray, cv2.CV_64F).var()
+
     def _fallback_liveness_check(self, image: np.ndarray, error: str) -> Dict:
         """
         Fallback method using basic image analysis
@@ -92,12 +140,9 @@ class AntiSpoofingService:
             Liveness check result
         """
         try:
-            # Basic texture analysis
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # Calculate Laplacian variance (blur detection)
-            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-            
+            # Basic texture analysis: Laplacian variance (blur detection)
+            laplacian_var = self._laplacian_variance(image)
+
             # Higher variance suggests more detail (real face)
             # Lower variance suggests printed/flat image
             score = min(1.0, laplacian_var / 1000.0)
@@ -153,8 +198,18 @@ class AntiSpoofingService:
                 'score': 0.0,
                 'message': 'No frames provided'
             }
-        
-        results = [self.check_liveness(frame) for frame in frames]
+
+        # Run all frames through one cached MiniFASNet instance and one shared
+        # detector; per-frame check_liveness would rebuild the full DeepFace
+        # pipeline (detector lookup + model lookup) K times for a single vote
+        # Only API drift in DeepFace's internals (missing module, renamed
+        # attribute, changed signature) triggers the fallback; a genuine
+        # failure inside the analysis itself should surface, not silently
+        # degrade to the slower per-frame path forever
+        try:
+            results = self._analyze_frames_batched(frames)
+        except (ImportError, AttributeError, TypeError):
+            results = [self.check_liveness(frame) for frame in frames]
         
         # Calculate average confidence
         confidences = [r['confidence'] for r in results]
@@ -171,6 +226,62 @@ class AntiSpoofingService:
             'message': f'Analyzed {len(frames)} frames. Real: {real_count}/{len(frames)}'
         }
 
+    def _get_spoof_model(self):
+        """Load and cache DeepFace's MiniFASNet anti-spoofing model"""
+        if self._spoof_model is None:
+            from deepface.modules import modeling
+            self._spoof_model = modeling.build_model(
+                task="spoofing", model_name="Fasnet")
+        return self._spoof_model
+
+    def _get_face_cascade(self):
+        """Load and cache the OpenCV Haar frontal-face detector"""
+        if self._face_cascade is None:
+            self._face_cascade = cv2.CascadeClassifier(
+                cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        return self._face_cascade
+
+    def _analyze_frames_batched(self, frames: list) -> list:
+        """
+        Run liveness on a batch of frames sharing one model and detector
+
+        Args:
+            frames: List of image arrays (BGR format)
+
+        Returns:
+            List of per-frame liveness result dictionaries
+        """
+        model = self._get_spoof_model()
+        cascade = self._get_face_cascade()
+
+        results = []
+        for frame in frames:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            faces = cascade.detectMultiScale(gray, 1.1, 5)
+
+            if len(faces) == 0:
+                results.append({
+                    'is_real': False,
+                    'confidence': 0.0,
+                    'score': 0.0,
+                    'message': 'No face detected'
+                })
+                continue
+
+            # Analyze the largest detected face
+            x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+            is_real, score = model.analyze(img=frame, facial_area=(x, y, w, h))
+            passes_threshold = score >= self.threshold
+
+            results.append({
+                'is_real': bool(is_real) and passes_threshold,
+                'confidence': float(score),
+                'score': float(score),
+                'message': self._get_message(bool(is_real), passes_threshold, float(score))
+            })
+
+        return results
+
 
 # Singleton instance
 _anti_spoof_service = None
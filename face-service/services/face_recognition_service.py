@@ -2,23 +2,105 @@
 Face Recognition Service
 Handles face detection, encoding, and verification
 """
+import cv2
 import face_recognition
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union
+import base64
+import functools
 import json
+import os
+
+from ._kernels import face_distance_128, warmup_kernels
+
+try:
+    import orjson
+
+    def _dump_encoding_json(arr: np.ndarray) -> str:
+        """Serialize an encoding ndarray to JSON without boxing 128 floats"""
+        return orjson.dumps(arr, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+except ImportError:
+    def _dump_encoding_json(arr: np.ndarray) -> str:
+        """stdlib fallback when orjson is not installed"""
+        return json.dumps(arr.tolist())
+
+# Encodings are stored and compared as float32: the raw 512-byte vector is
+# ~10-20x smaller than JSON decimals and fp32 is ample precision for a 0.6
+# distance threshold.
+ENCODING_DTYPE = np.float32
+
+# HOG detection cost scales with pixel count; recognition works fine at ~640px,
+# so larger images are downscaled before detection and boxes scaled back up
+DETECTION_MAX_DIMENSION = 640
+
+
+@functools.lru_cache(maxsize=4096)
+def _encoding_to_np(encoding: tuple) -> np.ndarray:
+    """
+    Convert an encoding tuple to a contiguous float32 array (cached)
+
+    The same stored encoding is sent on every authentication attempt for a
+    given user, so repeated requests skip the list-to-ndarray conversion.
+    """
+    return np.asarray(encoding, dtype=ENCODING_DTYPE)
+
+
+def _as_encoding_array(encoding: Union[List[float], bytes, str, np.ndarray]) -> np.ndarray:
+    """
+    Normalize any supported encoding representation to a float32 ndarray
+
+    Accepts a float list (legacy JSON transport), raw float32 bytes, a base64
+    string of those bytes, or an ndarray. The bytes paths are zero-copy via
+    np.frombuffer.
+    """
+    if isinstance(encoding, np.ndarray):
+        return np.ascontiguousarray(encoding, dtype=ENCODING_DTYPE)
+    if isinstance(encoding, str):
+        encoding = base64.b64decode(encoding)
+    if isinstance(encoding, (bytes, bytearray, memoryview)):
+        return np.frombuffer(encoding, dtype=ENCODING_DTYPE)
+    return _encoding_to_np(tuple(encoding))
 
 
 class FaceRecognitionService:
     """Service for face detection, encoding, and matching"""
     
-    def __init__(self, match_threshold: float = 0.6):
+    def __init__(self, match_threshold: float = 0.6,
+                 detection_max_dim: int = DETECTION_MAX_DIMENSION):
         """
         Initialize face recognition service
-        
+
         Args:
             match_threshold: Distance threshold for face matching (lower = stricter)
+            detection_max_dim: Longest image side used for detection; larger
+                images are downscaled before running the detector
         """
         self.match_threshold = match_threshold
+        self.detection_max_dim = detection_max_dim
+
+        # Optional ONNX detector (quantized SCRFD): much faster than HOG on
+        # CPUs with VNNI. Enabled by pointing FACE_DETECTOR_ONNX at a model.
+        self._onnx_detector = None
+        onnx_path = os.getenv('FACE_DETECTOR_ONNX')
+        if onnx_path:
+            try:
+                from .onnx_detector import OnnxFaceDetector
+                self._onnx_detector = OnnxFaceDetector(onnx_path)
+            except Exception as e:
+                print(f"ONNX detector unavailable, falling back to HOG: {e}")
+
+        # Optional ONNX encoder (bf16/int8 export of the 128-d ResNet),
+        # enabled by pointing FACE_ENCODER_ONNX at a model
+        self._onnx_encoder = None
+        encoder_path = os.getenv('FACE_ENCODER_ONNX')
+        if encoder_path:
+            try:
+                from .onnx_encoder import OnnxFaceEncoder
+                self._onnx_encoder = OnnxFaceEncoder(encoder_path)
+            except Exception as e:
+                print(f"ONNX encoder unavailable, falling back to dlib: {e}")
+        # Compile the distance kernel now so the first request doesn't pay JIT latency
+        warmup_kernels()
     
     def detect_faces(self, image: np.ndarray, model: str = 'hog') -> List[Tuple[int, int, int, int]]:
         """
@@ -30,59 +112,113 @@ class FaceRecognitionService:
             
         Returns:
             List of face locations [(top, right, bottom, left), ...]
+            in the coordinates of the original image
         """
         try:
-            locations = face_recognition.face_locations(image, model=model)
+            if self._onnx_detector is not None:
+                return self._onnx_detector.detect(image)
+
+            small, scale = self._downscale_for_detection(image)
+            locations = face_recognition.face_locations(small, model=model)
+            if scale != 1.0:
+                inv = 1.0 / scale
+                locations = [self._scale_location(loc, inv) for loc in locations]
             return locations
         except Exception as e:
             print(f"Face detection error: {e}")
             return []
+
+    def _downscale_for_detection(self, image: np.ndarray) -> Tuple[np.ndarray, float]:
+        """
+        Downscale an image so its longest side is at most detection_max_dim
+
+        Args:
+            image: Image array
+
+        Returns:
+            Tuple of (possibly resized image, applied scale factor)
+        """
+        height, width = image.shape[:2]
+        longest = max(height, width)
+        if longest <= self.detection_max_dim:
+            return image, 1.0
+
+        scale = self.detection_max_dim / longest
+        small = cv2.resize(image, None, fx=scale, fy=scale,
+                           interpolation=cv2.INTER_AREA)
+        return small, scale
+
+    @staticmethod
+    def _scale_location(location: Tuple[int, int, int, int], factor: float) -> Tuple[int, int, int, int]:
+        """Scale a (top, right, bottom, left) box by the given factor"""
+        return tuple(int(round(v * factor)) for v in location)
     
-    def encode_face(self, image: np.ndarray, face_location: Optional[Tuple] = None) -> Optional[List[float]]:
+    def encode_face(self, image: np.ndarray, face_location: Optional[Tuple] = None) -> Optional[np.ndarray]:
         """
         Generate 128-dimensional face encoding
-        
+
         Args:
             image: Image array in RGB format
             face_location: Optional pre-detected face location
-            
+
         Returns:
-            Face encoding as list of floats, or None if no face found
+            Face encoding as float32 ndarray, or None if no face found
         """
         try:
+            if self._onnx_encoder is not None and face_location:
+                try:
+                    return self._onnx_encoder.encode(image, face_location)
+                except Exception as e:
+                    print(f"ONNX encoder error, falling back to dlib: {e}")
+
+            # The 5-point 'small' landmark model is ~3x faster than the default
+            # 68-point one and aligns well enough for this match threshold
             if face_location:
                 # Use provided location
-                encodings = face_recognition.face_encodings(image, [face_location])
+                encodings = face_recognition.face_encodings(
+                    image, [face_location], num_jitters=1, model='small')
             else:
                 # Auto-detect face
-                encodings = face_recognition.face_encodings(image)
-            
+                encodings = face_recognition.face_encodings(
+                    image, num_jitters=1, model='small')
+
             if encodings:
-                # Convert numpy array to list for JSON serialization
-                return encodings[0].tolist()
+                return encodings[0].astype(ENCODING_DTYPE, copy=False)
             return None
         except Exception as e:
             print(f"Face encoding error: {e}")
             return None
     
-    def compare_faces(self, known_encoding: List[float], unknown_encoding: List[float]) -> Dict:
+    def compare_faces(self, known_encoding: Union[List[float], bytes, str, np.ndarray],
+                      unknown_encoding: Union[List[float], np.ndarray]) -> Dict:
         """
         Compare two face encodings
-        
+
         Args:
-            known_encoding: Reference face encoding
+            known_encoding: Reference face encoding (float list, raw float32
+                bytes, base64 of those bytes, or ndarray)
             unknown_encoding: Face encoding to compare
-            
+
         Returns:
             Dictionary with match result and distance
         """
         try:
-            # Convert lists back to numpy arrays
-            known_np = np.array(known_encoding)
-            unknown_np = np.array(unknown_encoding)
-            
-            # Calculate face distance (Euclidean distance)
-            distance = face_recognition.face_distance([known_np], unknown_np)[0]
+            # Normalize to contiguous float32 arrays for the JIT kernel.
+            # The known encoding repeats across requests, so its conversion is cached;
+            # bytes/ndarray inputs skip conversion entirely.
+            known_np = _as_encoding_array(known_encoding)
+            unknown_np = _as_encoding_array(unknown_encoding)
+
+            # The JIT kernel indexes both arrays without bounds checking, and
+            # the known encoding arrives from the network at arbitrary length;
+            # reject anything that isn't a 128-d vector before invoking it
+            if known_np.shape != (128,) or unknown_np.shape != (128,):
+                raise ValueError(
+                    f'Encodings must be 128-dimensional, '
+                    f'got {known_np.shape} and {unknown_np.shape}')
+
+            # Calculate face distance (Euclidean distance) via the compiled kernel
+            distance = face_distance_128(known_np, unknown_np)
             
             # Check if match
             is_match = distance <= self.match_threshold
@@ -118,9 +254,27 @@ class FaceRecognitionService:
         Returns:
             Verification result with detection and matching info
         """
-        # Detect faces
-        face_locations = self.detect_faces(image)
-        
+        # Detect and encode on the downscaled image so both the HOG pyramid
+        # and dlib's chip extraction touch far fewer pixels
+        small, scale = self._downscale_for_detection(image)
+        face_locations = self.detect_faces(small)
+
+        failure = self._check_single_face(face_locations)
+        if failure is not None:
+            return failure
+
+        # Encode the detected face
+        unknown_encoding = self.encode_face(small, face_locations[0])
+
+        if unknown_encoding is None:
+            return self._encoding_failed_result()
+
+        return self._build_verify_result(
+            known_encoding, unknown_encoding, face_locations[0], scale)
+
+    @staticmethod
+    def _check_single_face(face_locations: List[Tuple]) -> Optional[Dict]:
+        """Return a failure result unless exactly one face was detected"""
         if not face_locations:
             return {
                 'success': False,
@@ -128,7 +282,7 @@ class FaceRecognitionService:
                 'message': 'No face detected in image',
                 'faces_detected': 0
             }
-        
+
         if len(face_locations) > 1:
             return {
                 'success': False,
@@ -136,28 +290,31 @@ class FaceRecognitionService:
                 'message': f'Multiple faces detected ({len(face_locations)}). Please ensure only one face is visible.',
                 'faces_detected': len(face_locations)
             }
-        
-        # Encode the detected face
-        unknown_encoding = self.encode_face(image, face_locations[0])
-        
-        if unknown_encoding is None:
-            return {
-                'success': False,
-                'match': False,
-                'message': 'Failed to encode detected face',
-                'faces_detected': 1
-            }
-        
-        # Compare encodings
+
+        return None
+
+    @staticmethod
+    def _encoding_failed_result() -> Dict:
+        """Failure result for a detected face that could not be encoded"""
+        return {
+            'success': False,
+            'match': False,
+            'message': 'Failed to encode detected face',
+            'faces_detected': 1
+        }
+
+    def _build_verify_result(self, known_encoding, unknown_encoding: np.ndarray,
+                             location: Tuple[int, int, int, int], scale: float) -> Dict:
+        """Compare encodings and assemble the verification result"""
         comparison = self.compare_faces(known_encoding, unknown_encoding)
-        
+
         return {
             'success': True,
             'match': comparison['match'],
             'distance': comparison['distance'],
             'confidence': comparison['confidence'],
             'faces_detected': 1,
-            'face_location': face_locations[0],
+            'face_location': self._scale_location(location, 1.0 / scale),
             'message': comparison['message']
         }
     
@@ -171,43 +328,42 @@ class FaceRecognitionService:
         Returns:
             Registration result with encoding
         """
-        # Detect faces
-        face_locations = self.detect_faces(image)
-        
-        if not face_locations:
+        # Detect and encode in one pass: face_encodings runs the detector
+        # internally, so a separate detect_faces call would re-preprocess
+        # the image for nothing. Face count comes from the output length.
+        try:
+            small, _ = self._downscale_for_detection(image)
+            encodings = face_recognition.face_encodings(
+                small, num_jitters=1, model='small')
+        except Exception as e:
+            print(f"Face encoding error: {e}")
+            encodings = []
+
+        if not encodings:
             return {
                 'success': False,
                 'message': 'No face detected in image',
                 'faces_detected': 0,
                 'encoding': None
             }
-        
-        if len(face_locations) > 1:
-            return {
-                'success': False,
-                'message': f'Multiple faces detected ({len(face_locations)}). Please ensure only one face is visible.',
-                'faces_detected': len(face_locations),
-                'encoding': None
-            }
-        
-        # Encode the face
-        encoding = self.encode_face(image, face_locations[0])
-        
-        if encoding is None:
+
+        if len(encodings) > 1:
             return {
                 'success': False,
-                'message': 'Failed to encode detected face',
-                'faces_detected': 1,
+                'message': f'Multiple faces detected ({len(encodings)}). Please ensure only one face is visible.',
+                'faces_detected': len(encodings),
                 'encoding': None
             }
-        
+
+        encoding = encodings[0].astype(ENCODING_DTYPE, copy=False)
+
         return {
             'success': True,
             'message': 'Face registered successfully',
             'faces_detected': 1,
-            'face_location': face_locations[0],
-            'encoding': encoding,
-            'encoding_json': json.dumps(encoding)  # For easy database storage
+            'encoding': encoding.tolist(),
+            'encoding_json': _dump_encoding_json(encoding),  # For easy database storage
+            'encoding_b64': base64.b64encode(encoding.tobytes()).decode()  # Compact raw float32 transport
         }
     
     def _get_match_message(self, is_match: bool, distance: float) -> str:
@@ -3,103 +3,598 @@ Face Utilities Module
 Handles image loading, validation, and preprocessing
 """
 import base64
+import functools
 import io
+import os
+import threading
+from collections import namedtuple
 import cv2
 import numpy as np
-from PIL import Image
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Union
+
+from ._kernels import NUMBA_AVAILABLE, swap_channels_inplace
+
+# Hoisted cv2 flags: module-level bindings skip the cv2.__dict__ attribute
+# lookup that every cvtColor/resize call in the hot path would otherwise do
+_RGB2BGR = cv2.COLOR_RGB2BGR
+_BGR2RGB = cv2.COLOR_BGR2RGB
+_RGBA2BGR = cv2.COLOR_RGBA2BGR
+_GRAY2BGR = cv2.COLOR_GRAY2BGR
+_INTER_AREA = cv2.INTER_AREA
+_INTER_LINEAR = cv2.INTER_LINEAR
+
+# Thread-local scratch buffers reused across calls to avoid reallocating
+# multi-megabyte arrays per image on sustained load
+_tls = threading.local()
+
+
+def _scratch(slot: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+    """
+    Return a reusable thread-local buffer view of the requested shape
+
+    Buffers grow monotonically and live per (thread, slot). The returned view
+    is only valid until the same thread requests the same slot again, so it
+    must not outlive the current processing step.
+    """
+    buffers = getattr(_tls, 'buffers', None)
+    if buffers is None:
+        buffers = _tls.buffers = {}
+
+    needed = int(np.prod(shape))
+    buf = buffers.get(slot)
+    if buf is None or buf.size < needed or buf.dtype != np.dtype(dtype):
+        buf = buffers[slot] = np.empty(needed, dtype=dtype)
+
+    return buf[:needed].reshape(shape)
+
+
+# Shared pool for batch decoding; built on first use so importing this
+# module never spawns threads
+_decode_pool = None
+_decode_pool_lock = threading.Lock()
+
+
+def _get_decode_pool():
+    """Lazily create the thread pool used by batch_base64_to_image"""
+    global _decode_pool
+    if _decode_pool is None:
+        with _decode_pool_lock:
+            if _decode_pool is None:
+                from concurrent.futures import ThreadPoolExecutor
+                _decode_pool = ThreadPoolExecutor(
+                    max_workers=min(4, os.cpu_count() or 1),
+                    thread_name_prefix='img-decode')
+    return _decode_pool
+
+try:
+    # SIMD (AVX2/AVX-512) base64 decoder; drop-in for the stdlib one
+    import pybase64
+    _b64decode = pybase64.b64decode
+    _b64decode_buf = pybase64.b64decode_as_bytearray
+except ImportError:
+    _b64decode = base64.b64decode
+    _b64decode_buf = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbo_jpeg = TurboJPEG()
+except Exception:
+    # Library (or the underlying libturbojpeg) not installed; JPEG payloads
+    # fall back to the generic decode path
+    _turbo_jpeg = None
+
+# Longest output side the JPEG fast path aims for when picking a decode-time
+# scaling factor; matches the detection downscale target
+JPEG_DECODE_TARGET = 640
+
+# Route resize_image through the panel-tiled variant. Worth enabling only in
+# multi-worker deployments where concurrent resizes contend for shared L3 and
+# DRAM bandwidth; single-worker setups should keep the one-shot resize.
+TILED_RESIZE = os.getenv('TILED_RESIZE', '0').lower() in ('1', 'true')
+
+def _cuda_available() -> bool:
+    """True when OpenCV was built with CUDA and a device is visible"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except Exception:
+        return False
+
+
+# GPU preprocessing is opt-in and only honored on CUDA-enabled OpenCV builds;
+# the stock opencv-python wheels ship without CUDA, so this stays off unless
+# a custom build is deployed alongside GPU inference
+GPU_PREPROCESS = (os.getenv('GPU_PREPROCESS', '0').lower() in ('1', 'true')
+                  and _cuda_available())
+
+# An image with its dimensions carried alongside, so per-frame loops unpack
+# shape[:2] (a tuple slice allocation) once instead of in every utility
+Frame = namedtuple('Frame', 'img h w')
+
+
+def _as_frame(image: Union[np.ndarray, Frame]) -> Frame:
+    """Wrap a raw array in a Frame; pass an existing Frame through untouched"""
+    if type(image) is Frame:
+        return image
+    height, width = image.shape[:2]
+    return Frame(image, height, width)
+
+
+def _jpeg_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read (height, width) from a JPEG SOF marker without decoding
+
+    Args:
+        data: Raw JPEG bytes
+
+    Returns:
+        (height, width) tuple, or None if no SOF marker was found
+    """
+    i = 2
+    n = len(data)
+    while i + 9 < n:
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        # SOF0-SOF15 carry the frame dimensions (except DHT/JPG/DAC markers)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = int.from_bytes(data[i + 5:i + 7], 'big')
+            width = int.from_bytes(data[i + 7:i + 9], 'big')
+            return height, width
+        i += 2 + int.from_bytes(data[i + 2:i + 4], 'big')
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _render_label(label: str, color: Tuple[int, int, int]) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Rasterize a label once onto a minimal sprite (cached per label/color)
+
+    Recognized names repeat across frames, so caching turns Hershey glyph
+    rasterization into a blit of the pre-rendered sprite.
+
+    Returns:
+        (sprite, glyph mask, text height above the baseline)
+    """
+    (text_w, text_h), baseline = cv2.getTextSize(
+        label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)
+    sprite = np.zeros((text_h + baseline, max(text_w, 1), 3), dtype=np.uint8)
+    cv2.putText(sprite, label, (0, text_h),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+    return sprite, sprite.any(axis=2), text_h
+
+
+def _is_known_image(data: bytes) -> bool:
+    """Check decoded bytes against the magic numbers of supported formats"""
+    return (
+        data.startswith(b'\xff\xd8\xff')         # JPEG
+        or data.startswith(b'\x89PNG\r\n\x1a\n')  # PNG
+        or data.startswith(b'GIF8')               # GIF
+        or data.startswith(b'BM')                 # BMP
+        or (data[:4] == b'RIFF' and data[8:12] == b'WEBP')
+    )
+
+
+def _pick_jpeg_scale(data: bytes, target: int = JPEG_DECODE_TARGET) -> Tuple[int, int]:
+    """
+    Choose a libjpeg-turbo scaling factor targeting ~target px longest side
+
+    Picks the strongest 1/2, 1/4, or 1/8 reduction that keeps the longest
+    side at or above the target, so face detection quality is unaffected.
+    """
+    dims = _jpeg_dimensions(data)
+    if dims is None:
+        return (1, 1)
+
+    longest = max(dims)
+    for denominator in (8, 4, 2):
+        if longest // denominator >= target:
+            return (1, denominator)
+    return (1, 1)
 
 
 class ImageProcessor:
     """Utility class for image processing operations"""
     
+    @staticmethod
+    def decode_base64(base64_string: str) -> bytes:
+        """
+        Decode a base64 image payload to raw bytes, validating the header
+
+        Args:
+            base64_string: Base64 encoded image string (data URL prefix allowed)
+
+        Returns:
+            Decoded image bytes (a bytes-like object; may be a bytearray)
+
+        Raises:
+            ValueError: If the payload is not valid base64 or not a
+                recognized image format
+        """
+        # Remove data URL prefix if present. The 'data:image/...;base64,'
+        # header is always short, so bounding the search keeps this O(1) and
+        # a single slice avoids split()'s list plus extra substring.
+        comma = base64_string.find(',', 0, 64)
+        if comma != -1:
+            base64_string = base64_string[comma + 1:]
+
+        try:
+            if _b64decode_buf is not None:
+                # Decode into a mutable bytearray: skips the extra immutable
+                # bytes copy, and np.frombuffer wraps it zero-copy downstream
+                img_bytes = _b64decode_buf(base64_string)
+            else:
+                img_bytes = _b64decode(base64_string, validate=False)
+        except Exception as e:
+            raise ValueError(f'Invalid base64 payload: {e}')
+
+        if not _is_known_image(img_bytes):
+            raise ValueError('Unrecognized image format')
+
+        return img_bytes
+
     @staticmethod
     def base64_to_image(base64_string: str) -> np.ndarray:
         """
         Convert base64 string to OpenCV image
-        
+
         Args:
             base64_string: Base64 encoded image string
-            
+
         Returns:
             OpenCV image (BGR format)
         """
-        # Remove data URL prefix if present
-        if ',' in base64_string:
-            base64_string = base64_string.split(',')[1]
-        
-        # Decode base64 to bytes
-        img_bytes = base64.b64decode(base64_string)
-        
-        # Convert to PIL Image
-        pil_image = Image.open(io.BytesIO(img_bytes))
-        
-        # Convert to RGB if needed
+        return ImageProcessor.bytes_to_image(
+            ImageProcessor.decode_base64(base64_string))
+
+    @staticmethod
+    def batch_base64_to_image(base64_strings: list) -> list:
+        """
+        Decode several base64 images concurrently
+
+        Both the base64 decode and cv2.imdecode release the GIL, so a small
+        shared thread pool overlaps the per-image work instead of decoding
+        the batch serially. Order is preserved; a failed entry surfaces as
+        None rather than failing the whole batch.
+
+        Args:
+            base64_strings: List of base64 encoded image strings
+
+        Returns:
+            List of OpenCV images (BGR format) or None per failed entry
+        """
+        if not base64_strings:
+            return []
+        if len(base64_strings) == 1:
+            try:
+                return [ImageProcessor.base64_to_image(base64_strings[0])]
+            except ValueError:
+                return [None]
+
+        def _decode_one(payload: str):
+            try:
+                return ImageProcessor.base64_to_image(payload)
+            except ValueError:
+                return None
+
+        return list(_get_decode_pool().map(_decode_one, base64_strings))
+
+    @staticmethod
+    def bytes_to_image(img_bytes: bytes,
+                       return_scale: bool = False) -> Union[np.ndarray, Tuple[np.ndarray, float]]:
+        """
+        Convert already-decoded image bytes to an OpenCV image
+
+        The JPEG fast path may decode at a reduced scale, so the returned
+        image can be smaller than the original pixels the client sent.
+        Callers that report coordinates back in the original image's space
+        must pass return_scale=True and divide by the returned scale.
+
+        Args:
+            img_bytes: Raw image file bytes (JPEG, PNG, ...)
+            return_scale: Also return the decode scale (decoded size over
+                original size; 1.0 when no decode-time downscale happened)
+
+        Returns:
+            OpenCV image (BGR format), or an (image, scale) tuple when
+            return_scale is True
+        """
+        # JPEG fast path: libjpeg-turbo decodes straight to BGR with SIMD
+        # and can downscale during the IDCT, skipping most of the work
+        if _turbo_jpeg is not None and img_bytes[:3] == b'\xff\xd8\xff':
+            num, den = _pick_jpeg_scale(img_bytes)
+            try:
+                img_bgr = _turbo_jpeg.decode(
+                    img_bytes,
+                    pixel_format=TJPF_BGR,
+                    scaling_factor=(num, den)
+                )
+                return (img_bgr, num / den) if return_scale else img_bgr
+            except Exception:
+                pass  # malformed or unsupported JPEG; use the generic path
+
+        # cv2.imdecode produces BGR directly through OpenCV's SIMD codecs,
+        # skipping the PIL round-trip and its extra RGB->BGR conversion pass
+        arr = np.frombuffer(img_bytes, dtype=np.uint8)
+        img_bgr = cv2.imdecode(arr, cv2.IMREAD_COLOR)
+        if img_bgr is None:
+            # Rare formats imdecode rejects still go through PIL
+            img_bgr = ImageProcessor._pil_decode(img_bytes)
+
+        return (img_bgr, 1.0) if return_scale else img_bgr
+
+    @staticmethod
+    def _pil_decode(img_bytes: bytes) -> np.ndarray:
+        """
+        PIL fallback decode for formats cv2.imdecode can't handle
+
+        Args:
+            img_bytes: Raw image file bytes
+
+        Returns:
+            OpenCV image (BGR format)
+
+        Raises:
+            ValueError: If the bytes are not decodable as an image
+        """
+        # Imported here so workers that never leave the cv2/TurboJPEG fast
+        # paths don't pay PIL's import time and resident memory at boot
+        from PIL import Image
+
+        try:
+            pil_image = Image.open(io.BytesIO(img_bytes))
+        except Exception as e:
+            raise ValueError(f'Undecodable image payload: {e}')
+
+        if pil_image.mode == 'L':
+            # Grayscale: expand 1->3 channels in one cvtColor pass instead of
+            # converting to RGB in PIL (3x-size intermediate) and swapping
+            return cv2.cvtColor(np.asarray(pil_image), _GRAY2BGR)
+
+        if pil_image.mode == 'RGBA':
+            # Fuse the alpha drop and channel swap into a single pass
+            return cv2.cvtColor(np.asarray(pil_image), _RGBA2BGR)
+
         if pil_image.mode != 'RGB':
             pil_image = pil_image.convert('RGB')
-        
-        # Convert to numpy array (RGB)
-        img_array = np.array(pil_image)
-        
-        # Convert RGB to BGR for OpenCV
-        img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-        
-        return img_bgr
+
+        # np.asarray wraps PIL's buffer without copying
+        return cv2.cvtColor(np.asarray(pil_image), _RGB2BGR)
     
     @staticmethod
-    def image_to_rgb(image: np.ndarray) -> np.ndarray:
+    def image_to_rgb(image: np.ndarray, copy: bool = True,
+                     reuse_buffer: bool = False) -> np.ndarray:
         """
         Convert BGR image to RGB
-        
+
         Args:
             image: OpenCV image in BGR format
-            
+            copy: When False, return a reversed-channel view sharing the
+                input buffer (zero-copy; callers needing contiguous data
+                such as dlib/DeepFace should keep copy=True)
+            reuse_buffer: Write into a thread-local scratch buffer instead of
+                allocating. Only safe when the result does not outlive the
+                current processing step on this thread.
+
         Returns:
             Image in RGB format
         """
-        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        # BGR->RGB is just a channel reversal; the strided-view copy skips
+        # cvtColor's conversion dispatch and its extra output allocation
+        view = image[:, :, ::-1]
+        if not copy:
+            return view
+        if reuse_buffer:
+            out = _scratch('rgb', image.shape, image.dtype)
+            np.copyto(out, view)
+            return out
+        return np.ascontiguousarray(view)
     
     @staticmethod
-    def validate_image_size(image: np.ndarray, min_size: int = 80) -> bool:
+    def image_to_rgb_inplace(image: np.ndarray) -> np.ndarray:
+        """
+        Convert BGR to RGB by swapping channels in place
+
+        Mutates and returns the input, so only for callers that are done
+        with the BGR original. Falls back to the copying conversion when
+        numba is not installed.
+
+        Args:
+            image: Contiguous OpenCV image in BGR format
+
+        Returns:
+            The same array, now in RGB channel order
+        """
+        if NUMBA_AVAILABLE:
+            swap_channels_inplace(image)
+            return image
+        return ImageProcessor.image_to_rgb(image)
+
+    @staticmethod
+    def validate_image_size(image: Union[np.ndarray, Frame],
+                            min_size: int = 80) -> bool:
         """
         Check if image is large enough for face detection
-        
+
         Args:
-            image: Image array
+            image: Image array or Frame
             min_size: Minimum dimension in pixels
-            
+
         Returns:
             True if image is valid
         """
-        height, width = image.shape[:2]
+        _, height, width = _as_frame(image)
         return height >= min_size and width >= min_size
     
     @staticmethod
-    def resize_image(image: np.ndarray, max_dimension: int = 1024) -> np.ndarray:
+    def resize_image(image: Union[np.ndarray, Frame], max_dimension: int = 1024,
+                     reuse_buffer: bool = False) -> np.ndarray:
         """
         Resize image if it's too large
-        
+
+        Args:
+            image: Input image array or Frame
+            max_dimension: Maximum width or height
+            reuse_buffer: Write into a thread-local scratch buffer instead of
+                allocating. Only safe when the result does not outlive the
+                current processing step on this thread.
+
+        Returns:
+            Resized image
+        """
+        image, height, width = _as_frame(image)
+
+        if height <= max_dimension and width <= max_dimension:
+            return image
+
+        # Calculate scaling factor
+        scale = min(max_dimension / height, max_dimension / width)
+        new_width = int(width * scale)
+        new_height = int(height * scale)
+
+        # INTER_AREA averages every source pixel, which matters for heavy
+        # downscales but is wasted work for mild ones; bilinear is visually
+        # equivalent above half-size and roughly twice as fast
+        interpolation = _INTER_LINEAR if scale >= 0.5 else _INTER_AREA
+
+        if TILED_RESIZE and not reuse_buffer:
+            return ImageProcessor.resize_image_tiled(image, max_dimension)
+
+        if reuse_buffer:
+            dst = _scratch('resize', (new_height, new_width) + image.shape[2:],
+                           image.dtype)
+            return cv2.resize(image, (new_width, new_height), dst=dst,
+                              interpolation=interpolation)
+
+        return cv2.resize(image, (new_width, new_height), interpolation=interpolation)
+
+    @staticmethod
+    def resize_image_tiled(image: np.ndarray, max_dimension: int = 1024) -> np.ndarray:
+        """
+        Resize by horizontal panels sized to stay L2-cache-resident
+
+        One-shot cv2.resize streams the whole multi-megabyte source through
+        the cache hierarchy; with several worker processes resizing at once
+        they evict each other from shared L3. Panels of ~256 KiB of source
+        rows keep each worker's active working set in its private L2, so
+        aggregate throughput scales with worker count instead of saturating
+        DRAM bandwidth.
+
         Args:
             image: Input image
             max_dimension: Maximum width or height
-            
+
         Returns:
             Resized image
         """
         height, width = image.shape[:2]
-        
+
         if height <= max_dimension and width <= max_dimension:
             return image
-        
-        # Calculate scaling factor
+
         scale = min(max_dimension / height, max_dimension / width)
         new_width = int(width * scale)
         new_height = int(height * scale)
-        
-        return cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
-    
+        interpolation = _INTER_LINEAR if scale >= 0.5 else _INTER_AREA
+
+        # Source rows per panel targeting ~256 KiB of BGR data
+        panel_h = max(8, (256 * 1024) // (width * 3))
+        if panel_h >= height:
+            return cv2.resize(image, (new_width, new_height),
+                              interpolation=interpolation)
+
+        out = np.empty((new_height, new_width) + image.shape[2:], dtype=image.dtype)
+        inv = height / new_height
+        y_out = 0
+        while y_out < new_height:
+            out_rows = min(max(1, int(panel_h * scale)), new_height - y_out)
+            src_top = int(y_out * inv)
+            src_bottom = min(height, int(np.ceil((y_out + out_rows) * inv)))
+            cv2.resize(image[src_top:src_bottom], (new_width, out_rows),
+                       dst=out[y_out:y_out + out_rows],
+                       interpolation=interpolation)
+            y_out += out_rows
+        return out
+
+    @staticmethod
+    def preprocess_pipeline(image: np.ndarray, max_dimension: int = 1024,
+                            to_rgb: bool = False, use_umat: bool = False) -> np.ndarray:
+        """
+        Resize and optionally color-convert an image in one pipeline
+
+        With use_umat=True the image is wrapped in cv2.UMat so OpenCV's
+        Transparent API dispatches both operations on its OpenCL (iGPU) or
+        SIMD backend, keeping the intermediate off the Python heap; the
+        result is materialized as a numpy array only at the end.
+
+        Args:
+            image: Input image (BGR format)
+            max_dimension: Maximum width or height after resizing
+            to_rgb: Also convert BGR to RGB
+            use_umat: Route through the OpenCV Transparent API
+
+        Returns:
+            Processed image
+        """
+        if use_umat:
+            src = cv2.UMat(image)
+            height, width = image.shape[:2]
+            if height > max_dimension or width > max_dimension:
+                scale = min(max_dimension / height, max_dimension / width)
+                src = cv2.resize(src, (int(width * scale), int(height * scale)),
+                                 interpolation=_INTER_AREA)
+            if to_rgb:
+                src = cv2.cvtColor(src, _BGR2RGB)
+            return src.get()
+
+        out = ImageProcessor.resize_image(image, max_dimension)
+        return ImageProcessor.image_to_rgb(out) if to_rgb else out
+
     @staticmethod
-    def draw_face_box(image: np.ndarray, location: Tuple[int, int, int, int], 
+    def base64_to_gpu_image(base64_string: str, max_dimension: int = 1024,
+                            to_rgb: bool = False):
+        """
+        Decode a base64 image and preprocess it on the GPU
+
+        Returns a cv2.cuda_GpuMat so a CUDA inference backend can consume
+        the tensor without a device-to-host round-trip after preprocessing.
+        JPEG entropy decode still runs on the CPU (the wheels don't bundle
+        nvjpeg); the pixels are uploaded once and the resize plus optional
+        BGR->RGB conversion run on the device.
+
+        Args:
+            base64_string: Base64 encoded image string
+            max_dimension: Maximum width or height after resizing
+            to_rgb: Also convert BGR to RGB on the device
+
+        Returns:
+            cv2.cuda_GpuMat with the preprocessed image
+
+        Raises:
+            RuntimeError: If GPU preprocessing is disabled or unavailable
+            ValueError: If the payload is not a valid image
+        """
+        if not GPU_PREPROCESS:
+            raise RuntimeError(
+                'GPU preprocessing requires GPU_PREPROCESS=1 and a '
+                'CUDA-enabled OpenCV build')
+
+        image = ImageProcessor.bytes_to_image(
+            ImageProcessor.decode_base64(base64_string))
+        gmat = cv2.cuda_GpuMat()
+        gmat.upload(image)
+
+        height, width = image.shape[:2]
+        if height > max_dimension or width > max_dimension:
+            scale = min(max_dimension / height, max_dimension / width)
+            gmat = cv2.cuda.resize(
+                gmat, (int(width * scale), int(height * scale)),
+                interpolation=_INTER_AREA)
+        if to_rgb:
+            gmat = cv2.cuda.cvtColor(gmat, _BGR2RGB)
+        return gmat
+
+    @staticmethod
+    def draw_face_box(image: np.ndarray, location: Tuple[int, int, int, int],
                       label: str = "", color: Tuple[int, int, int] = (0, 255, 0)) -> np.ndarray:
         """
         Draw bounding box on face
@@ -118,11 +613,80 @@ class ImageProcessor:
         # Draw rectangle
         cv2.rectangle(image, (left, top), (right, bottom), color, 2)
         
-        # Draw label if provided
+        # Draw label if provided, blitting the cached sprite where the
+        # baseline-anchored putText output would have landed
         if label:
-            cv2.putText(image, label, (left, top - 10), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-        
+            sprite, mask, text_h = _render_label(label, color)
+            sprite_h, sprite_w = sprite.shape[:2]
+            y0 = top - 10 - text_h
+            x0 = left
+
+            ys, xs = max(0, y0), max(0, x0)
+            ye = min(image.shape[0], y0 + sprite_h)
+            xe = min(image.shape[1], x0 + sprite_w)
+            if ye > ys and xe > xs:
+                sub_mask = mask[ys - y0:ye - y0, xs - x0:xe - x0]
+                image[ys:ye, xs:xe][sub_mask] = \
+                    sprite[ys - y0:ye - y0, xs - x0:xe - x0][sub_mask]
+
+        return image
+
+    @staticmethod
+    def draw_face_boxes(image: np.ndarray, locations: list,
+                        labels: Optional[list] = None,
+                        color: Tuple[int, int, int] = (0, 255, 0)) -> np.ndarray:
+        """
+        Draw bounding boxes for several faces with one polylines call
+
+        Looping draw_face_box pays a Python-to-C dispatch per face; here all
+        rectangle contours are packed into one vertex array and drawn by a
+        single cv2.polylines call. Labels (when given) still blit per face
+        using the cached sprites.
+
+        Args:
+            image: Image to draw on
+            locations: Face locations [(top, right, bottom, left), ...]
+            labels: Optional per-face label texts, parallel to locations
+            color: Box color in BGR
+
+        Returns:
+            Image with bounding boxes
+        """
+        if not locations:
+            return image
+
+        loc = np.asarray(locations, dtype=np.int32)
+        top, right, bottom, left = loc[:, 0], loc[:, 1], loc[:, 2], loc[:, 3]
+
+        # (N, 4, 1, 2) closed-contour vertices: TL, TR, BR, BL per face
+        pts = np.empty((len(loc), 4, 1, 2), dtype=np.int32)
+        pts[:, 0, 0, 0] = left
+        pts[:, 0, 0, 1] = top
+        pts[:, 1, 0, 0] = right
+        pts[:, 1, 0, 1] = top
+        pts[:, 2, 0, 0] = right
+        pts[:, 2, 0, 1] = bottom
+        pts[:, 3, 0, 0] = left
+        pts[:, 3, 0, 1] = bottom
+        cv2.polylines(image, pts, isClosed=True, color=color, thickness=2)
+
+        if labels:
+            for location, label in zip(locations, labels):
+                if not label:
+                    continue
+                sprite, mask, text_h = _render_label(label, color)
+                sprite_h, sprite_w = sprite.shape[:2]
+                y0 = location[0] - 10 - text_h
+                x0 = location[3]
+
+                ys, xs = max(0, y0), max(0, x0)
+                ye = min(image.shape[0], y0 + sprite_h)
+                xe = min(image.shape[1], x0 + sprite_w)
+                if ye > ys and xe > xs:
+                    sub_mask = mask[ys - y0:ye - y0, xs - x0:xe - x0]
+                    image[ys:ye, xs:xe][sub_mask] = \
+                        sprite[ys - y0:ye - y0, xs - x0:xe - x0][sub_mask]
+
         return image
 
 
@@ -136,39 +700,88 @@ def validate_base64_image(base64_string: str) -> bool:
     Returns:
         True if valid image
     """
+    # Structural check only: decoding the first base64 quads yields enough
+    # bytes to cover every magic number _is_known_image looks at, so a
+    # multi-megabyte payload is validated without a full decode. Slicing at
+    # a multiple of 4 keeps the prefix independently decodable.
+    comma = base64_string.find(',', 0, 64)
+    if comma != -1:
+        base64_string = base64_string[comma + 1:]
+
+    prefix = base64_string[:88]
+    if len(prefix) % 4:
+        return False
+
     try:
-        ImageProcessor.base64_to_image(base64_string)
-        return True
+        head = _b64decode(prefix, validate=True)
     except Exception:
         return False
 
+    return _is_known_image(head)
+
 
-def extract_face_region(image: np.ndarray, location: Tuple[int, int, int, int], 
-                       padding: int = 20) -> Optional[np.ndarray]:
+def _check_location(location) -> Tuple[int, int, int, int]:
     """
-    Extract face region from image with padding
-    
+    Validate a face location, returning its four integer coordinates
+
     Args:
-        image: Source image
         location: Face location (top, right, bottom, left)
-        padding: Padding in pixels
-        
+
     Returns:
-        Cropped face region or None
+        The four coordinates as plain ints
+
+    Raises:
+        ValueError: If location is not a 4-sequence of integer-likes
     """
     try:
-        height, width = image.shape[:2]
         top, right, bottom, left = location
-        
-        # Add padding
-        top = max(0, top - padding)
-        left = max(0, left - padding)
-        bottom = min(height, bottom + padding)
-        right = min(width, right + padding)
-        
-        # Extract region
-        face_region = image[top:bottom, left:right]
-        
-        return face_region if face_region.size > 0 else None
-    except Exception:
+        return int(top), int(right), int(bottom), int(left)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f'Invalid face location {location!r}: {e}')
+
+
+def extract_face_region(image: Union[np.ndarray, Frame],
+                        location: Tuple[int, int, int, int],
+                        padding: int = 20, copy: bool = False) -> Optional[np.ndarray]:
+    """
+    Extract face region from image with padding
+
+    By default the returned region is a zero-copy view into the source
+    image: it shares memory, so mutating either aliases the other, and
+    consumers requiring contiguous data (dlib already copies internally)
+    should pass copy=True to get an independent contiguous array.
+
+    Args:
+        image: Source image array or Frame
+        location: Face location (top, right, bottom, left)
+        padding: Padding in pixels
+        copy: Return an independent contiguous copy instead of a view
+
+    Returns:
+        Cropped face region, or None for a degenerate (empty) crop
+
+    Raises:
+        ValueError: If location is malformed
+    """
+    # Precondition check instead of a blanket try/except: a malformed
+    # location is a programmer error and should surface, and skipping the
+    # per-call exception-state setup keeps the per-face hot path cheap
+    top, right, bottom, left = _check_location(location)
+    image, height, width = _as_frame(image)
+
+    # Pad and clamp in one vectorized step: np.clip lowers to branchless
+    # min/max instructions instead of four Python-level comparisons
+    coords = np.array([top - padding, left - padding,
+                       bottom + padding, right + padding], dtype=np.int32)
+    np.clip(coords, 0, [height, width, height, width], out=coords)
+    top, left, bottom, right = coords
+
+    # Extract region; the clamp guarantees in-bounds indices, so only a
+    # degenerate (inverted or zero-area) box can produce an empty slice.
+    # Two integer truthiness tests on the slice shape beat the .size
+    # property, which multiplies out every dimension
+    face_region = image[top:bottom, left:right]
+
+    if not (face_region.shape[0] and face_region.shape[1]):
         return None
+    return np.ascontiguousarray(face_region) if copy else face_region
@@ -0,0 +1,155 @@
+"""
+ONNX Face Detector Module
+SCRFD-style detector running on ONNX Runtime (int8/fp32 CPU inference)
+"""
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+# SCRFD decodes anchor-free distance boxes at three feature-map strides,
+# with two anchor centers per cell
+STRIDES = (8, 16, 32)
+NUM_ANCHORS = 2
+INPUT_SIZE = 640
+
+
+class OnnxFaceDetector:
+    """SCRFD face detector on the ONNX Runtime CPU execution provider
+
+    A quantized SCRFD-500m model detects faces in one forward pass at a
+    fraction of the cost of dlib's HOG sliding window; on VNNI-capable CPUs
+    the int8 path uses hardware dot-product instructions. The model file is
+    supplied by deployment config (see FACE_DETECTOR_ONNX).
+    """
+
+    def __init__(self, model_path: str, score_threshold: float = 0.5,
+                 nms_threshold: float = 0.4, intra_op_threads: int = 2):
+        """
+        Initialize the detector session
+
+        Args:
+            model_path: Path to the SCRFD ONNX model file
+            score_threshold: Minimum face confidence to keep
+            nms_threshold: IoU threshold for non-maximum suppression
+            intra_op_threads: ONNX Runtime intra-op thread count
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        self.score_threshold = score_threshold
+        self.nms_threshold = nms_threshold
+        self._anchor_centers = {}
+
+    def detect(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """
+        Detect faces in an image
+
+        Args:
+            image: Image array (RGB or BGR; SCRFD is channel-order tolerant
+                after mean/scale normalization)
+
+        Returns:
+            List of face locations [(top, right, bottom, left), ...] in
+            original image coordinates
+        """
+        blob, scale = self._preprocess(image)
+        outputs = self.session.run(None, {self.input_name: blob})
+        boxes, scores = self._decode(outputs)
+
+        if boxes.shape[0] == 0:
+            return []
+
+        keep = self._nms(boxes, scores)
+        boxes = boxes[keep] / scale
+
+        return [
+            (int(y1), int(x2), int(y2), int(x1))
+            for x1, y1, x2, y2 in boxes.round()
+        ]
+
+    def _preprocess(self, image: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Letterbox into the model input and normalize to NCHW float32"""
+        height, width = image.shape[:2]
+        scale = INPUT_SIZE / max(height, width)
+
+        new_w, new_h = int(width * scale), int(height * scale)
+        resized = cv2.resize(image, (new_w, new_h))
+
+        canvas = np.zeros((INPUT_SIZE, INPUT_SIZE, 3), dtype=np.float32)
+        canvas[:new_h, :new_w] = resized
+        canvas = (canvas - 127.5) / 128.0
+
+        return canvas.transpose(2, 0, 1)[np.newaxis], scale
+
+    def _centers_for_stride(self, stride: int) -> np.ndarray:
+        """Anchor center grid for one stride level (cached per stride)"""
+        centers = self._anchor_centers.get(stride)
+        if centers is None:
+            side = INPUT_SIZE // stride
+            grid = np.stack(
+                np.mgrid[:side, :side][::-1], axis=-1).astype(np.float32)
+            centers = (grid * stride).reshape(-1, 2)
+            centers = np.repeat(centers, NUM_ANCHORS, axis=0)
+            self._anchor_centers[stride] = centers
+        return centers
+
+    def _decode(self, outputs: list) -> Tuple[np.ndarray, np.ndarray]:
+        """Decode per-stride scores and distance boxes into xyxy + scores"""
+        all_boxes = []
+        all_scores = []
+
+        for level, stride in enumerate(STRIDES):
+            scores = outputs[level].reshape(-1)
+            distances = outputs[level + len(STRIDES)].reshape(-1, 4) * stride
+
+            mask = scores >= self.score_threshold
+            if not mask.any():
+                continue
+
+            centers = self._centers_for_stride(stride)[mask]
+            distances = distances[mask]
+
+            # Distances are (left, top, right, bottom) offsets from the center
+            boxes = np.empty_like(distances)
+            boxes[:, 0] = centers[:, 0] - distances[:, 0]
+            boxes[:, 1] = centers[:, 1] - distances[:, 1]
+            boxes[:, 2] = centers[:, 0] + distances[:, 2]
+            boxes[:, 3] = centers[:, 1] + distances[:, 3]
+
+            all_boxes.append(boxes)
+            all_scores.append(scores[mask])
+
+        if not all_boxes:
+            return np.empty((0, 4), dtype=np.float32), np.empty(0, dtype=np.float32)
+
+        return np.concatenate(all_boxes), np.concatenate(all_scores)
+
+    def _nms(self, boxes: np.ndarray, scores: np.ndarray) -> List[int]:
+        """Greedy IoU non-maximum suppression"""
+        x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+        areas = (x2 - x1) * (y2 - y1)
+        order = scores.argsort()[::-1]
+
+        keep = []
+        while order.size > 0:
+            i = order[0]
+            keep.append(int(i))
+
+            xx1 = np.maximum(x1[i], x1[order[1:]])
+            yy1 = np.maximum(y1[i], y1[order[1:]])
+            xx2 = np.minimum(x2[i], x2[order[1:]])
+            yy2 = np.minimum(y2[i], y2[order[1:]])
+
+            inter = np.maximum(0.0, xx2 - xx1) * np.maximum(0.0, yy2 - yy1)
+            iou = inter / (areas[i] + areas[order[1:]] - inter)
+
+            order = order[1:][iou <= self.nms_threshold]
+
+        return keep
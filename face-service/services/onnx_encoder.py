@@ -0,0 +1,75 @@
+"""
+ONNX Face Encoder Module
+128-d face encoder running on ONNX Runtime (bf16/int8 CPU inference)
+"""
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+# dlib's encoder operates on 150x150 aligned chips with 25% context padding
+CHIP_SIZE = 150
+CHIP_PADDING = 0.25
+
+
+class OnnxFaceEncoder:
+    """Face encoder on the ONNX Runtime CPU execution provider
+
+    Runs an offline ONNX export of a 128-d face embedding network (dlib's
+    ResNet-29 or equivalent) in reduced precision: bf16 halves memory
+    bandwidth and int8 uses VNNI dot products on CPUs that support them.
+    Outputs are cast back to float32 so match-threshold semantics are
+    unchanged. The model file is supplied by deployment config (see
+    FACE_ENCODER_ONNX).
+    """
+
+    def __init__(self, model_path: str, intra_op_threads: int = 2):
+        """
+        Initialize the encoder session
+
+        Args:
+            model_path: Path to the encoder ONNX model file
+            intra_op_threads: ONNX Runtime intra-op thread count
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def encode(self, image: np.ndarray, location: Tuple[int, int, int, int]) -> np.ndarray:
+        """
+        Encode the face at a detected location
+
+        Args:
+            image: Image array in RGB format
+            location: Face location (top, right, bottom, left)
+
+        Returns:
+            128-dimensional face encoding as float32 ndarray
+        """
+        chip = self._extract_chip(image, location)
+        blob = (chip.astype(np.float32) / 255.0).transpose(2, 0, 1)[np.newaxis]
+        embedding = self.session.run(None, {self.input_name: blob})[0]
+        return embedding.reshape(-1).astype(np.float32, copy=False)
+
+    @staticmethod
+    def _extract_chip(image: np.ndarray, location: Tuple[int, int, int, int]) -> np.ndarray:
+        """Crop the padded face box and resize to the encoder chip size"""
+        height, width = image.shape[:2]
+        top, right, bottom, left = location
+
+        pad_h = int((bottom - top) * CHIP_PADDING)
+        pad_w = int((right - left) * CHIP_PADDING)
+
+        top = max(0, top - pad_h)
+        left = max(0, left - pad_w)
+        bottom = min(height, bottom + pad_h)
+        right = min(width, right + pad_w)
+
+        face = image[top:bottom, left:right]
+        return cv2.resize(face, (CHIP_SIZE, CHIP_SIZE), interpolation=cv2.INTER_LINEAR)
@@ -0,0 +1,54 @@
+"""
+Shared Memory Transfer Module
+Passes decoded images between processes without pickle copies
+"""
+from multiprocessing import shared_memory
+from typing import Tuple
+
+import numpy as np
+
+# Spec sent across the process boundary instead of the pixel data itself:
+# (segment name, array shape, dtype string)
+ImageSpec = Tuple[str, tuple, str]
+
+
+def share_image(image: np.ndarray) -> Tuple[shared_memory.SharedMemory, ImageSpec]:
+    """
+    Copy an image into a fresh SharedMemory segment
+
+    Args:
+        image: Image array to share
+
+    Returns:
+        Tuple of (segment handle, spec). The caller keeps the handle and must
+        close and unlink it once the worker result has been received.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=image.nbytes)
+    view = np.ndarray(image.shape, dtype=image.dtype, buffer=shm.buf)
+    np.copyto(view, image)
+    return shm, (shm.name, image.shape, image.dtype.str)
+
+
+def attach_image(spec: ImageSpec) -> Tuple[np.ndarray, shared_memory.SharedMemory]:
+    """
+    Attach to a shared image segment as a zero-copy ndarray view
+
+    Args:
+        spec: (segment name, shape, dtype string) produced by share_image
+
+    Returns:
+        Tuple of (image view, segment handle). The caller must close the
+        handle when done with the view.
+    """
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf), shm
+
+
+def release_image(shm: shared_memory.SharedMemory) -> None:
+    """Close and unlink a segment created by share_image"""
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass